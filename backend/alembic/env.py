@@ -9,7 +9,7 @@ from sqlalchemy import engine_from_config, pool
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from app.database import Base
-from app.models import Product, TussCode  # noqa: F401 - ensure models are imported
+from app import models  # noqa: F401 - ensure models are imported
 
 config = context.config
 
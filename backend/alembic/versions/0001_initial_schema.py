@@ -0,0 +1,98 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+Databases created before migrations were introduced already have some of
+these tables (built by ``Base.metadata.create_all``), so each table is only
+created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("products"):
+        op.create_table(
+            "products",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("cod_produto", sa.String(), nullable=False),
+            sa.Column("plano_produto", sa.String(), nullable=False),
+            sa.Column("plano_ans", sa.String(), nullable=False),
+            sa.Column("nome_registrado_ans", sa.String(), nullable=False),
+            sa.Column("segmentacao", sa.String(), nullable=False),
+            sa.Column("classificacao", sa.String(), nullable=False),
+            sa.Column("cod_operadora", sa.String(), nullable=False),
+            sa.Column("nome_operadora", sa.String(), nullable=False),
+            sa.Column("situacao", sa.String(), nullable=False),
+            sa.Column("cod_produto_api", sa.String(), nullable=False),
+            sa.Column("cod_plano_api", sa.String(), nullable=False),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+            ),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+            ),
+        )
+        op.create_index("ix_products_cod_produto", "products", ["cod_produto"])
+
+    if not inspector.has_table("tuss_codes"):
+        op.create_table(
+            "tuss_codes",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("codigo", sa.String(), nullable=False),
+            sa.Column("descricao", sa.String(), nullable=False),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+            ),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+            ),
+        )
+        op.create_index(
+            "ix_tuss_codes_codigo", "tuss_codes", ["codigo"], unique=True
+        )
+
+    if not inspector.has_table("change_log"):
+        op.create_table(
+            "change_log",
+            sa.Column("seq", sa.BigInteger(), primary_key=True, autoincrement=True),
+            sa.Column("entity", sa.String(), nullable=False),
+            sa.Column("entity_key", sa.String(), nullable=False),
+            sa.Column("op", sa.String(), nullable=False),
+            sa.Column("data", sa.JSON(), nullable=True),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+            ),
+        )
+        op.create_index(
+            "ix_change_log_entity_key", "change_log", ["entity", "entity_key"]
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("change_log")
+    op.drop_table("tuss_codes")
+    op.drop_table("products")
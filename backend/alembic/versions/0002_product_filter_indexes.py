@@ -0,0 +1,52 @@
+"""product filter indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:30:00.000000
+
+Indexes for the filter combinations issued by ``list_products`` and for the
+DISTINCT/ORDER BY queries behind ``/api/filters/*``, each of which can be
+answered by an index-only scan on the leading column:
+
+- (cod_produto, plano_produto): product and product+plan lookups
+- (plano_produto): plan-name filter, plan names
+- (segmentacao, classificacao, situacao): segment filter combinations, segments
+- (classificacao, situacao): classification (+ status) filter, classifications
+- (situacao): status filter, statuses
+
+The existing single-column cod_produto index stays: it is the narrowest
+source for the product-code DISTINCT.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRODUCT_INDEXES = {
+    "ix_products_cod_produto_plano_produto": ["cod_produto", "plano_produto"],
+    "ix_products_plano_produto": ["plano_produto"],
+    "ix_products_segmentacao_classificacao_situacao": [
+        "segmentacao",
+        "classificacao",
+        "situacao",
+    ],
+    "ix_products_classificacao_situacao": ["classificacao", "situacao"],
+    "ix_products_situacao": ["situacao"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in PRODUCT_INDEXES.items():
+        op.create_index(name, "products", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name in PRODUCT_INDEXES:
+        op.drop_index(name, table_name="products")
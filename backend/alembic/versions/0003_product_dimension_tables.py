@@ -0,0 +1,165 @@
+"""product dimension tables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:00:00.000000
+
+Moves the operator, segment, classification and status strings that every
+products row repeated into small lookup tables referenced by integer foreign
+keys, converting the existing rows in place. The string-column filter indexes
+from 0002 are replaced by equivalent indexes on the foreign keys.
+
+Dropped columns only free their space once the table is rewritten, which
+cannot happen inside the migration transaction; ``seed.py`` runs
+``VACUUM FULL products`` after an upgrade that applied this revision. Run it
+by hand when upgrading with ``alembic upgrade`` directly.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# lookup table -> (products foreign key, old products column)
+NAMED_DIMENSIONS = {
+    "segments": ("segment_id", "segmentacao"),
+    "classifications": ("classification_id", "classificacao"),
+    "statuses": ("status_id", "situacao"),
+}
+
+OLD_COLUMNS = [
+    "cod_operadora",
+    "nome_operadora",
+    "segmentacao",
+    "classificacao",
+    "situacao",
+]
+
+OLD_INDEXES = {
+    "ix_products_segmentacao_classificacao_situacao": [
+        "segmentacao",
+        "classificacao",
+        "situacao",
+    ],
+    "ix_products_classificacao_situacao": ["classificacao", "situacao"],
+    "ix_products_situacao": ["situacao"],
+}
+
+NEW_INDEXES = {
+    "ix_products_segment_classification_status": [
+        "segment_id",
+        "classification_id",
+        "status_id",
+    ],
+    "ix_products_classification_status": ["classification_id", "status_id"],
+    "ix_products_status_id": ["status_id"],
+    "ix_products_operator_id": ["operator_id"],
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "operators",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("cod_operadora", sa.String(), nullable=False),
+        sa.Column("nome_operadora", sa.String(), nullable=False),
+        sa.UniqueConstraint("cod_operadora", "nome_operadora"),
+    )
+    for table in NAMED_DIMENSIONS:
+        op.create_table(
+            table,
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("name", sa.String(), nullable=False, unique=True),
+        )
+
+    op.execute(
+        "INSERT INTO operators (cod_operadora, nome_operadora) "
+        "SELECT DISTINCT cod_operadora, nome_operadora FROM products "
+        "ORDER BY cod_operadora, nome_operadora"
+    )
+    for table, (_, column) in NAMED_DIMENSIONS.items():
+        op.execute(
+            f"INSERT INTO {table} (name) "
+            f"SELECT DISTINCT {column} FROM products ORDER BY {column}"
+        )
+
+    op.add_column("products", sa.Column("operator_id", sa.Integer(), nullable=True))
+    for fk_column, _ in NAMED_DIMENSIONS.values():
+        op.add_column("products", sa.Column(fk_column, sa.Integer(), nullable=True))
+
+    # One pass over products fills all four foreign keys
+    op.execute(
+        """
+        UPDATE products p
+        SET operator_id = o.id,
+            segment_id = s.id,
+            classification_id = c.id,
+            status_id = st.id
+        FROM operators o, segments s, classifications c, statuses st
+        WHERE o.cod_operadora = p.cod_operadora
+          AND o.nome_operadora = p.nome_operadora
+          AND s.name = p.segmentacao
+          AND c.name = p.classificacao
+          AND st.name = p.situacao
+        """
+    )
+
+    op.alter_column("products", "operator_id", nullable=False)
+    op.create_foreign_key(
+        "fk_products_operator_id", "products", "operators", ["operator_id"], ["id"]
+    )
+    for table, (fk_column, _) in NAMED_DIMENSIONS.items():
+        op.alter_column("products", fk_column, nullable=False)
+        op.create_foreign_key(
+            f"fk_products_{fk_column}", "products", table, [fk_column], ["id"]
+        )
+
+    for name in OLD_INDEXES:
+        op.drop_index(name, table_name="products")
+    for column in OLD_COLUMNS:
+        op.drop_column("products", column)
+    for name, columns in NEW_INDEXES.items():
+        op.create_index(name, "products", columns)
+
+
+def downgrade() -> None:
+    for name in NEW_INDEXES:
+        op.drop_index(name, table_name="products")
+    for column in OLD_COLUMNS:
+        op.add_column("products", sa.Column(column, sa.String(), nullable=True))
+
+    op.execute(
+        """
+        UPDATE products p
+        SET cod_operadora = o.cod_operadora,
+            nome_operadora = o.nome_operadora,
+            segmentacao = s.name,
+            classificacao = c.name,
+            situacao = st.name
+        FROM operators o, segments s, classifications c, statuses st
+        WHERE o.id = p.operator_id
+          AND s.id = p.segment_id
+          AND c.id = p.classification_id
+          AND st.id = p.status_id
+        """
+    )
+    for column in OLD_COLUMNS:
+        op.alter_column("products", column, nullable=False)
+    for name, columns in OLD_INDEXES.items():
+        op.create_index(name, "products", columns)
+
+    op.drop_constraint("fk_products_operator_id", "products", type_="foreignkey")
+    op.drop_column("products", "operator_id")
+    for table, (fk_column, _) in NAMED_DIMENSIONS.items():
+        op.drop_constraint(f"fk_products_{fk_column}", "products", type_="foreignkey")
+        op.drop_column("products", fk_column)
+
+    op.drop_table("operators")
+    for table in NAMED_DIMENSIONS:
+        op.drop_table(table)
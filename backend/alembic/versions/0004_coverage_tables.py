@@ -0,0 +1,50 @@
+"""coverage tables
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 11:00:00.000000
+
+Plan-by-procedure coverage stored both ways as sorted integer arrays: one
+row per product listing its TUSS code ids, and one row per TUSS code listing
+its product ids. Either question is answered by a single primary-key lookup.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "plan_coverage",
+        sa.Column(
+            "product_id",
+            sa.Integer(),
+            sa.ForeignKey("products.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("tuss_ids", postgresql.ARRAY(sa.Integer()), nullable=False),
+    )
+    op.create_table(
+        "code_coverage",
+        sa.Column(
+            "tuss_id",
+            sa.Integer(),
+            sa.ForeignKey("tuss_codes.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("product_ids", postgresql.ARRAY(sa.Integer()), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("code_coverage")
+    op.drop_table("plan_coverage")
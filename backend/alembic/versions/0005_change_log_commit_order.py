@@ -0,0 +1,52 @@
+"""change log commit order
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 12:00:00.000000
+
+``change_log.seq`` came straight from its sequence, so two writers running at
+once (the seed script and the scraper) could commit their entries out of seq
+order, and a client that had already read past a seq would never see a lower
+one that committed later.
+
+A BEFORE INSERT trigger now takes a transaction-level advisory lock and only
+then draws the seq. The lock is held until commit, so change log writers run
+one at a time and seqs become visible in order. The column default still
+draws a value first; those values are discarded, which only leaves gaps.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Arbitrary advisory lock id reserved for change log writers
+CHANGE_LOG_LOCK_ID = 7_260_001
+
+
+def upgrade() -> None:
+    op.execute(
+        f"""
+        CREATE FUNCTION change_log_assign_seq() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock({CHANGE_LOG_LOCK_ID});
+            NEW.seq := nextval(pg_get_serial_sequence('change_log', 'seq'));
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER change_log_assign_seq BEFORE INSERT ON change_log "
+        "FOR EACH ROW EXECUTE FUNCTION change_log_assign_seq()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER change_log_assign_seq ON change_log")
+    op.execute("DROP FUNCTION change_log_assign_seq()")
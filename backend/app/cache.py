@@ -0,0 +1,47 @@
+"""In-memory structures derived from the catalog, rebuilt when it changes."""
+
+import threading
+import time
+
+from app.changes import latest_seq
+from app.config import settings
+
+
+class CatalogCache:
+    """
+    Lazily built value that is rebuilt whenever the catalog changes.
+
+    The catalog version is the latest change log sequence. It is re-read at
+    most every ``settings.catalog_cache_ttl`` seconds, so requests in between
+    never touch the database.
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+        self._checked_at = 0.0
+
+    @property
+    def version(self) -> int | None:
+        return self._version
+
+    def _fresh(self) -> bool:
+        return (
+            self._value is not None
+            and time.monotonic() - self._checked_at < settings.catalog_cache_ttl
+        )
+
+    def get(self, db):
+        if self._fresh():
+            return self._value
+        with self._lock:
+            if self._fresh():
+                return self._value
+            version = latest_seq(db)
+            if self._value is None or version != self._version:
+                self._value = self._build(db)
+                self._version = version
+            self._checked_at = time.monotonic()
+            return self._value
@@ -0,0 +1,80 @@
+"""Change log for products and TUSS codes.
+
+Writers (the seed script and the scraper) record every insert, update and
+delete here so API clients can pull deltas from ``/api/changes`` instead of
+re-downloading the whole catalog.
+
+Writers take turns: a trigger on ``change_log`` (migration 0005) holds an
+advisory lock from a transaction's first entry until it commits, so entries
+become visible in ``seq`` order and ``since`` never skips a late commit.
+"""
+
+from sqlalchemy import delete, func, select
+
+from app.models import ChangeLogEntry
+from app.schemas import product_to_frontend, tuss_to_frontend
+
+ENTITY_PRODUCT = "product"
+ENTITY_TUSS = "tuss"
+
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+
+
+def product_key(product) -> str:
+    """Natural key of a product row, stable across re-seeds and scrapes."""
+    return "|".join(
+        (
+            product.cod_produto,
+            product.plano_produto,
+            product.plano_ans,
+            product.cod_plano_api,
+        )
+    )
+
+
+def product_change(product, op: str = OP_UPSERT) -> ChangeLogEntry:
+    if op == OP_DELETE:
+        data = {
+            "productCode": product.cod_produto,
+            "planName": product.plano_produto,
+            "ansCode": product.plano_ans,
+            "apiPlanCode": product.cod_plano_api,
+        }
+    else:
+        data = product_to_frontend(product).model_dump()
+    return ChangeLogEntry(
+        entity=ENTITY_PRODUCT, entity_key=product_key(product), op=op, data=data
+    )
+
+
+def tuss_change(tuss, op: str = OP_UPSERT) -> ChangeLogEntry:
+    if op == OP_DELETE:
+        data = {"code": tuss.codigo}
+    else:
+        data = tuss_to_frontend(tuss).model_dump()
+    return ChangeLogEntry(
+        entity=ENTITY_TUSS, entity_key=tuss.codigo, op=op, data=data
+    )
+
+
+def latest_seq(session) -> int:
+    return session.query(func.max(ChangeLogEntry.seq)).scalar() or 0
+
+
+def compact_change_log(session) -> int:
+    """
+    Drop entries superseded by a later entry for the same row.
+
+    Only the newest entry per (entity, key) is kept, so a client replaying
+    from any ``since`` still ends up with the current state. Delete entries
+    are kept as tombstones for the same reason.
+    """
+    newest = select(func.max(ChangeLogEntry.seq)).group_by(
+        ChangeLogEntry.entity, ChangeLogEntry.entity_key
+    )
+    result = session.execute(
+        delete(ChangeLogEntry).where(ChangeLogEntry.seq.not_in(newest))
+    )
+    session.commit()
+    return result.rowcount
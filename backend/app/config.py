@@ -3,7 +3,15 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "postgresql://descobre:descobre@db:5432/descobre_saude"
+    # Optional read replica for GET endpoints; writes always use database_url
+    database_replica_url: str | None = None
+    replica_max_lag_seconds: float = 10.0
+    replica_lag_check_interval: float = 5.0
+    db_pool_size: int = 5
     app_name: str = "Descobre Saude API"
+    snapshot_dir: str = "snapshots"
+    # Seconds between checks of the change log for in-memory catalog caches
+    catalog_cache_ttl: float = 30.0
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,93 @@
+"""
+Bulk loader for the plan-by-procedure coverage matrix.
+
+The input is a CSV of (product, TUSS code) pairs, one per line, with the
+header ``cod_produto,plano_produto,plano_ans,cod_plano_api,codigo``. Products
+are matched on the same natural key the change log uses.
+
+Rows are streamed into a temporary staging table with COPY, so memory use does
+not depend on the size of the matrix; the per-plan and per-code arrays are
+then built by Postgres and swapped in within the same transaction.
+"""
+
+from sqlalchemy import text
+
+COVERAGE_COLUMNS = (
+    "cod_produto",
+    "plano_produto",
+    "plano_ans",
+    "cod_plano_api",
+    "codigo",
+)
+
+
+def load_coverage(connection, csv_file) -> dict:
+    """
+    Replace the coverage tables with the pairs read from ``csv_file``.
+
+    ``connection`` is a SQLAlchemy connection inside a transaction; the caller
+    commits. Returns row counts for reporting.
+    """
+    connection.execute(
+        text(
+            """
+            CREATE TEMP TABLE coverage_staging (
+                cod_produto text, plano_produto text, plano_ans text,
+                cod_plano_api text, codigo text
+            ) ON COMMIT DROP
+            """
+        )
+    )
+
+    cursor = connection.connection.cursor()
+    cursor.copy_expert(
+        f"COPY coverage_staging ({', '.join(COVERAGE_COLUMNS)}) "
+        "FROM STDIN WITH (FORMAT csv, HEADER true)",
+        csv_file,
+    )
+    staged = cursor.rowcount
+    cursor.close()
+
+    connection.execute(
+        text(
+            """
+            CREATE TEMP TABLE coverage_pairs ON COMMIT DROP AS
+            SELECT DISTINCT p.id AS product_id, t.id AS tuss_id
+            FROM coverage_staging s
+            JOIN products p
+              ON p.cod_produto = s.cod_produto
+             AND p.plano_produto = s.plano_produto
+             AND p.plano_ans = s.plano_ans
+             AND p.cod_plano_api = s.cod_plano_api
+            JOIN tuss_codes t ON t.codigo = s.codigo
+            """
+        )
+    )
+
+    connection.execute(text("DELETE FROM plan_coverage"))
+    plans = connection.execute(
+        text(
+            """
+            INSERT INTO plan_coverage (product_id, tuss_ids)
+            SELECT product_id, array_agg(tuss_id ORDER BY tuss_id)
+            FROM coverage_pairs
+            GROUP BY product_id
+            """
+        )
+    ).rowcount
+
+    connection.execute(text("DELETE FROM code_coverage"))
+    codes = connection.execute(
+        text(
+            """
+            INSERT INTO code_coverage (tuss_id, product_ids)
+            SELECT tuss_id, array_agg(product_id ORDER BY product_id)
+            FROM coverage_pairs
+            GROUP BY tuss_id
+            """
+        )
+    ).rowcount
+
+    pairs = connection.execute(text("SELECT count(*) FROM coverage_pairs")).scalar()
+
+    return {"staged": staged, "pairs": pairs, "plans": plans, "codes": codes}
@@ -1,19 +1,113 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from app.config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+logger = logging.getLogger(__name__)
+
+engine = create_engine(
+    settings.database_url, pool_pre_ping=True, pool_size=settings.db_pool_size
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only endpoints use the replica when one is configured
+if settings.database_replica_url:
+    read_engine = create_engine(
+        settings.database_replica_url,
+        pool_pre_ping=True,
+        pool_size=settings.db_pool_size,
+    )
+else:
+    read_engine = engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Seconds since the last replayed transaction, or 0 once the replica has
+# replayed everything it received (an idle primary sends nothing new). NULL
+# when the WAL receiver is not streaming: replay then sits at the last
+# received LSN and would otherwise look caught up forever. The receiver's
+# status is only visible to roles with pg_read_all_stats.
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+class ReplicaMonitor:
+    """
+    Tracks whether the replica is close enough to the primary to serve reads.
+
+    Lag is measured at most every ``settings.replica_lag_check_interval``
+    seconds; an unreachable or disconnected replica counts as lagging.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._healthy = True
+        self._checked_at = 0.0
+
+    def _measure(self) -> bool:
+        try:
+            with read_engine.connect() as conn:
+                lag = conn.execute(REPLICA_LAG_SQL).scalar()
+        except Exception as e:
+            logger.warning(f"Replica lag check failed, reading from primary: {e}")
+            return False
+        if lag is None:
+            logger.warning("Replica is not streaming, reading from primary")
+            return False
+        lag = float(lag)
+        if lag > settings.replica_max_lag_seconds:
+            logger.warning(f"Replica lags by {lag:.1f}s, reading from primary")
+            return False
+        return True
+
+    def healthy(self) -> bool:
+        if read_engine is engine:
+            return True
+        interval = settings.replica_lag_check_interval
+        if time.monotonic() - self._checked_at < interval:
+            return self._healthy
+        with self._lock:
+            if time.monotonic() - self._checked_at >= interval:
+                self._healthy = self._measure()
+                self._checked_at = time.monotonic()
+            return self._healthy
+
+
+replica_monitor = ReplicaMonitor()
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Session for read-only endpoints: the replica unless it lags too far."""
+    factory = ReadSessionLocal if replica_monitor.healthy() else SessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
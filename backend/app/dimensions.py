@@ -0,0 +1,50 @@
+"""Lookup-table rows (operator, segment, classification, status) for product writers."""
+
+from app.models import Classification, Operator, Product, Segment, Status
+
+
+class DimensionCache:
+    """
+    Get-or-create lookup rows, memoised for the lifetime of one load.
+
+    The lookup tables hold a handful of rows each, so a seed or scrape run
+    resolves every distinct value once instead of querying per product.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._rows = {}
+
+    def get(self, model, **values):
+        key = (model, tuple(sorted(values.items())))
+        row = self._rows.get(key)
+        if row is None:
+            row = self.session.query(model).filter_by(**values).one_or_none()
+            if row is None:
+                row = model(**values)
+                self.session.add(row)
+                self.session.flush()
+            self._rows[key] = row
+        return row
+
+    def assign(self, product: Product, raw: dict) -> None:
+        """
+        Point ``product`` at the lookup rows for a raw catalog record.
+
+        Both the relationship and the foreign key are set, so the product
+        works with ``bulk_save_objects`` as well as with the unit of work.
+        """
+        product.operator = self.get(
+            Operator,
+            cod_operadora=raw.get("codOperadora", ""),
+            nome_operadora=raw.get("nomeOperadora", ""),
+        )
+        product.segment = self.get(Segment, name=raw.get("segmentacao", ""))
+        product.classification = self.get(
+            Classification, name=raw.get("classificacao", "")
+        )
+        product.status = self.get(Status, name=raw.get("situacao", ""))
+        product.operator_id = product.operator.id
+        product.segment_id = product.segment.id
+        product.classification_id = product.classification.id
+        product.status_id = product.status.id
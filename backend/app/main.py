@@ -1,13 +1,28 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.routers.changes import router as changes_router
+from app.routers.coverage import router as coverage_router
 from app.routers.providers import router as providers_router
+from app.routers.snapshots import router as snapshots_router
+from app.routers.suggest import router as suggest_router
+from app.warmup import warm_up
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up()
+    yield
+
 
 app = FastAPI(
     title=settings.app_name,
     description="API for Descobre Saude - SulAmerica Coverage Explorer",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -19,6 +34,10 @@ app.add_middleware(
 )
 
 app.include_router(providers_router)
+app.include_router(changes_router)
+app.include_router(coverage_router)
+app.include_router(snapshots_router)
+app.include_router(suggest_router)
 
 
 @app.get("/api/health")
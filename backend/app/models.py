@@ -1,21 +1,80 @@
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import relationship
 
 from app.database import Base
 
 
+class Operator(Base):
+    __tablename__ = "operators"
+    __table_args__ = (UniqueConstraint("cod_operadora", "nome_operadora"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    cod_operadora = Column(String, nullable=False)
+    nome_operadora = Column(String, nullable=False)
+
+
+class Segment(Base):
+    __tablename__ = "segments"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False, unique=True)
+
+
+class Classification(Base):
+    __tablename__ = "classifications"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False, unique=True)
+
+
+class Status(Base):
+    __tablename__ = "statuses"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False, unique=True)
+
+
 class Product(Base):
     __tablename__ = "products"
+    # Mirrors the filter indexes added in migrations 0002 and 0003
+    __table_args__ = (
+        Index("ix_products_cod_produto_plano_produto", "cod_produto", "plano_produto"),
+        Index("ix_products_cod_produto", "cod_produto"),
+        Index("ix_products_plano_produto", "plano_produto"),
+        Index(
+            "ix_products_segment_classification_status",
+            "segment_id",
+            "classification_id",
+            "status_id",
+        ),
+        Index("ix_products_classification_status", "classification_id", "status_id"),
+        Index("ix_products_status_id", "status_id"),
+        Index("ix_products_operator_id", "operator_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    cod_produto = Column(String, nullable=False, index=True)
+    cod_produto = Column(String, nullable=False)
     plano_produto = Column(String, nullable=False)
     plano_ans = Column(String, nullable=False)
     nome_registrado_ans = Column(String, nullable=False)
-    segmentacao = Column(String, nullable=False)
-    classificacao = Column(String, nullable=False)
-    cod_operadora = Column(String, nullable=False)
-    nome_operadora = Column(String, nullable=False)
-    situacao = Column(String, nullable=False)
+    operator_id = Column(Integer, ForeignKey("operators.id"), nullable=False)
+    segment_id = Column(Integer, ForeignKey("segments.id"), nullable=False)
+    classification_id = Column(
+        Integer, ForeignKey("classifications.id"), nullable=False
+    )
+    status_id = Column(Integer, ForeignKey("statuses.id"), nullable=False)
     cod_produto_api = Column(String, nullable=False)
     cod_plano_api = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -23,6 +82,32 @@ class Product(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    operator = relationship(Operator, lazy="joined", innerjoin=True)
+    segment = relationship(Segment, lazy="joined", innerjoin=True)
+    classification = relationship(Classification, lazy="joined", innerjoin=True)
+    status = relationship(Status, lazy="joined", innerjoin=True)
+
+    # Read-only views of the attributes that used to be stored on the row
+    @property
+    def cod_operadora(self) -> str:
+        return self.operator.cod_operadora
+
+    @property
+    def nome_operadora(self) -> str:
+        return self.operator.nome_operadora
+
+    @property
+    def segmentacao(self) -> str:
+        return self.segment.name
+
+    @property
+    def classificacao(self) -> str:
+        return self.classification.name
+
+    @property
+    def situacao(self) -> str:
+        return self.status.name
+
 
 class TussCode(Base):
     __tablename__ = "tuss_codes"
@@ -34,3 +119,39 @@ class TussCode(Base):
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+
+
+class ChangeLogEntry(Base):
+    """One insert/update/delete of a product or TUSS code, in commit order."""
+
+    __tablename__ = "change_log"
+    __table_args__ = (Index("ix_change_log_entity_key", "entity", "entity_key"),)
+
+    seq = Column(BigInteger, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)
+    entity_key = Column(String, nullable=False)
+    op = Column(String, nullable=False)
+    data = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class PlanCoverage(Base):
+    """TUSS codes covered by one product, as a sorted array of ``tuss_codes.id``."""
+
+    __tablename__ = "plan_coverage"
+
+    product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    tuss_ids = Column(ARRAY(Integer), nullable=False)
+
+
+class CodeCoverage(Base):
+    """Products covering one TUSS code, as a sorted array of ``products.id``."""
+
+    __tablename__ = "code_coverage"
+
+    tuss_id = Column(
+        Integer, ForeignKey("tuss_codes.id", ondelete="CASCADE"), primary_key=True
+    )
+    product_ids = Column(ARRAY(Integer), nullable=False)
@@ -0,0 +1,36 @@
+"""Product code -> plan names map behind ``/api/products/grouped``."""
+
+import hashlib
+import json
+from typing import NamedTuple
+
+from app.models import Product
+from app.schemas import ProductGroup
+
+
+class ProductGroups(NamedTuple):
+    etag: str
+    body: bytes
+
+
+def _code_sort_key(code: str):
+    # Numeric product codes sort numerically, as in the provider finder
+    return (0, int(code), code) if code.isdigit() else (1, 0, code)
+
+
+def build_product_groups(db) -> ProductGroups:
+    """Serialise the grouped catalog once; requests reuse the bytes."""
+    plans: dict[str, set[str]] = {}
+    for cod_produto, plano_produto in db.query(
+        Product.cod_produto, Product.plano_produto
+    ).distinct():
+        plans.setdefault(cod_produto, set()).add(plano_produto)
+
+    groups = [
+        ProductGroup(productCode=code, planNames=sorted(names)).model_dump()
+        for code, names in sorted(plans.items(), key=lambda i: _code_sort_key(i[0]))
+    ]
+    body = json.dumps(groups, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+    return ProductGroups(etag=f'"{hashlib.sha256(body).hexdigest()[:16]}"', body=body)
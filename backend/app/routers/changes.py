@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_read_db
+from app.models import ChangeLogEntry
+from app.schemas import ChangeFeed, ChangeOut
+
+router = APIRouter(prefix="/api", tags=["changes"])
+
+
+@router.get("/changes", response_model=ChangeFeed)
+def list_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=5000),
+    db: Session = Depends(get_read_db),
+):
+    entries = (
+        db.query(ChangeLogEntry)
+        .filter(ChangeLogEntry.seq > since)
+        .order_by(ChangeLogEntry.seq)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    return ChangeFeed(
+        changes=[
+            ChangeOut(
+                seq=e.seq,
+                entity=e.entity,
+                key=e.entity_key,
+                op=e.op,
+                data=e.data,
+            )
+            for e in entries
+        ],
+        next_since=entries[-1].seq if entries else since,
+        has_more=has_more,
+    )
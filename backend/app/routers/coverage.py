@@ -0,0 +1,103 @@
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.database import get_read_db
+from app.models import CodeCoverage, PlanCoverage, Product, TussCode
+from app.routers.providers import filter_products
+from app.schemas import (
+    PaginatedProducts,
+    PaginatedTussCodes,
+    product_to_frontend,
+    tuss_to_frontend,
+)
+
+router = APIRouter(prefix="/api/coverage", tags=["coverage"])
+
+
+@router.get("/tuss/{code}/plans", response_model=PaginatedProducts)
+def list_plans_covering_code(
+    code: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    product_code: str | None = None,
+    plan_name: str | None = None,
+    segment: str | None = None,
+    classification: str | None = None,
+    status: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    tuss_id = db.query(TussCode.id).filter(TussCode.codigo == code).scalar()
+    if tuss_id is None:
+        raise HTTPException(status_code=404, detail="TUSS code not found")
+
+    covering_ids = select(func.unnest(CodeCoverage.product_ids)).where(
+        CodeCoverage.tuss_id == tuss_id
+    )
+    query = filter_products(
+        db.query(Product).filter(Product.id.in_(covering_ids)),
+        product_code=product_code,
+        plan_name=plan_name,
+        segment=segment,
+        classification=classification,
+        status=status,
+    )
+
+    total = query.count()
+    total_pages = max(1, math.ceil(total / page_size))
+    offset = (page - 1) * page_size
+    products = query.order_by(Product.id).offset(offset).limit(page_size).all()
+
+    return PaginatedProducts(
+        items=[product_to_frontend(p) for p in products],
+        total=total,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages,
+    )
+
+
+@router.get("/products/{product_id}/codes", response_model=PaginatedTussCodes)
+def list_codes_covered_by_plan(
+    product_id: int,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    prefix: str | None = None,
+    search: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    if db.query(Product.id).filter(Product.id == product_id).scalar() is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    covered_ids = select(func.unnest(PlanCoverage.tuss_ids)).where(
+        PlanCoverage.product_id == product_id
+    )
+    query = db.query(TussCode).filter(TussCode.id.in_(covered_ids))
+
+    if prefix:
+        query = query.filter(TussCode.codigo.like(f"{prefix.strip()}%"))
+    if search:
+        like_term = f"%{search.strip().lower()}%"
+        query = query.filter(
+            or_(
+                TussCode.codigo.like(f"%{search.strip()}%"),
+                func.lower(TussCode.descricao).like(like_term),
+            )
+        )
+
+    total = query.count()
+    total_pages = max(1, math.ceil(total / page_size))
+    offset = (page - 1) * page_size
+    tuss_codes = (
+        query.order_by(TussCode.codigo).offset(offset).limit(page_size).all()
+    )
+
+    return PaginatedTussCodes(
+        items=[tuss_to_frontend(t) for t in tuss_codes],
+        total=total,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages,
+    )
@@ -1,66 +1,92 @@
 import math
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, or_
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import exists, func, or_, select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models import Product, TussCode
+from app.cache import CatalogCache
+from app.database import get_read_db
+from app.models import Classification, Product, Segment, Status, TussCode
 from app.schemas import (
     PaginatedProducts,
     PaginatedTussCodes,
     ProductFrontend,
+    ProductGroup,
     StatsOut,
     TussCodeFrontend,
+    TussTreeOut,
+    product_to_frontend,
+    tuss_to_frontend,
 )
+from app.product_groups import build_product_groups
+from app.tuss_tree import build_tuss_tree
 
 router = APIRouter(prefix="/api", tags=["providers"])
 
+tuss_tree = CatalogCache(build_tuss_tree)
+product_groups = CatalogCache(build_product_groups)
 
-def _product_to_frontend(p: Product) -> ProductFrontend:
-    return ProductFrontend(
-        productCode=p.cod_produto,
-        planName=p.plano_produto,
-        ansCode=p.plano_ans,
-        ansRegisteredName=p.nome_registrado_ans,
-        segment=p.segmentacao,
-        classification=p.classificacao,
-        operatorCode=p.cod_operadora,
-        operatorName=p.nome_operadora,
-        status=p.situacao,
-        apiProductCode=p.cod_produto_api,
-        apiPlanCode=p.cod_plano_api,
-    )
 
+def _lookup_id(model, name: str):
+    """Scalar subquery resolving a lookup-table name to its id."""
+    return select(model.id).where(model.name == name).scalar_subquery()
 
-def _tuss_to_frontend(t: TussCode) -> TussCodeFrontend:
-    return TussCodeFrontend(code=t.codigo, description=t.descricao)
 
+def _used_names(db: Session, model, fk_column) -> list[str]:
+    """Names of a lookup table that are referenced by at least one product."""
+    results = (
+        db.query(model.name)
+        .filter(exists().where(fk_column == model.id))
+        .order_by(model.name)
+        .all()
+    )
+    return [r[0] for r in results]
 
-@router.get("/products", response_model=PaginatedProducts)
-def list_products(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(50, ge=1, le=500),
+
+def filter_products(
+    query,
     product_code: str | None = None,
     plan_name: str | None = None,
     segment: str | None = None,
     classification: str | None = None,
     status: str | None = None,
-    search: str | None = None,
-    db: Session = Depends(get_db),
 ):
-    query = db.query(Product)
-
+    """Apply the equality filters shared by the product listing endpoints."""
     if product_code:
         query = query.filter(Product.cod_produto == product_code)
     if plan_name:
         query = query.filter(Product.plano_produto == plan_name)
     if segment:
-        query = query.filter(Product.segmentacao == segment)
+        query = query.filter(Product.segment_id == _lookup_id(Segment, segment))
     if classification:
-        query = query.filter(Product.classificacao == classification)
+        query = query.filter(
+            Product.classification_id == _lookup_id(Classification, classification)
+        )
     if status:
-        query = query.filter(Product.situacao == status)
+        query = query.filter(Product.status_id == _lookup_id(Status, status))
+    return query
+
+
+@router.get("/products", response_model=PaginatedProducts)
+def list_products(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    product_code: str | None = None,
+    plan_name: str | None = None,
+    segment: str | None = None,
+    classification: str | None = None,
+    status: str | None = None,
+    search: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    query = filter_products(
+        db.query(Product),
+        product_code=product_code,
+        plan_name=plan_name,
+        segment=segment,
+        classification=classification,
+        status=status,
+    )
     if search:
         search_term = f"%{search.lower()}%"
         query = query.filter(
@@ -78,7 +104,7 @@ def list_products(
     products = query.offset(offset).limit(page_size).all()
 
     return PaginatedProducts(
-        items=[_product_to_frontend(p) for p in products],
+        items=[product_to_frontend(p) for p in products],
         total=total,
         page=page,
         page_size=page_size,
@@ -86,14 +112,54 @@ def list_products(
     )
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against each tag listed in If-None-Match."""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(
+        tag == "*" or tag.removeprefix("W/") == etag for tag in tags if tag
+    )
+
+
+@router.get("/products/grouped", response_model=list[ProductGroup])
+def get_product_groups(request: Request, db: Session = Depends(get_read_db)):
+    groups = product_groups.get(db)
+    headers = {"ETag": groups.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match", ""), groups.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=groups.body, media_type="application/json", headers=headers
+    )
+
+
+@router.get("/products/lookup", response_model=ProductFrontend)
+def lookup_product(
+    product_code: str, plan_name: str, db: Session = Depends(get_read_db)
+):
+    # Served by ix_products_cod_produto_plano_produto
+    product = (
+        db.query(Product)
+        .filter(
+            Product.cod_produto == product_code,
+            Product.plano_produto == plan_name,
+        )
+        .order_by(Product.id)
+        .first()
+    )
+    if not product:
+        from fastapi import HTTPException
+
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product_to_frontend(product)
+
+
 @router.get("/products/{product_id}", response_model=ProductFrontend)
-def get_product(product_id: int, db: Session = Depends(get_db)):
+def get_product(product_id: int, db: Session = Depends(get_read_db)):
     product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
         from fastapi import HTTPException
 
         raise HTTPException(status_code=404, detail="Product not found")
-    return _product_to_frontend(product)
+    return product_to_frontend(product)
 
 
 @router.get("/tuss", response_model=PaginatedTussCodes)
@@ -101,7 +167,7 @@ def list_tuss_codes(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=500),
     search: str | None = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     query = db.query(TussCode)
 
@@ -124,7 +190,7 @@ def list_tuss_codes(
     tuss_codes = query.offset(offset).limit(page_size).all()
 
     return PaginatedTussCodes(
-        items=[_tuss_to_frontend(t) for t in tuss_codes],
+        items=[tuss_to_frontend(t) for t in tuss_codes],
         total=total,
         page=page,
         page_size=page_size,
@@ -132,25 +198,42 @@ def list_tuss_codes(
     )
 
 
+@router.get("/tuss/tree", response_model=TussTreeOut)
+def get_tuss_tree(prefix: str = "", db: Session = Depends(get_read_db)):
+    tree = tuss_tree.get(db)
+    if prefix not in tree:
+        from fastapi import HTTPException
+
+        raise HTTPException(status_code=404, detail="No TUSS codes with this prefix")
+    return TussTreeOut(
+        prefix=prefix,
+        count=tree.counts[prefix],
+        children=tree.children.get(prefix, []),
+    )
+
+
 @router.get("/tuss/{code}", response_model=TussCodeFrontend)
-def get_tuss_code(code: str, db: Session = Depends(get_db)):
+def get_tuss_code(code: str, db: Session = Depends(get_read_db)):
     tuss = db.query(TussCode).filter(TussCode.codigo == code).first()
     if not tuss:
         from fastapi import HTTPException
 
         raise HTTPException(status_code=404, detail="TUSS code not found")
-    return _tuss_to_frontend(tuss)
+    return tuss_to_frontend(tuss)
 
 
 @router.get("/stats", response_model=StatsOut)
-def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_read_db)):
     total_products = db.query(func.count(Product.id)).scalar() or 0
     total_tuss = db.query(func.count(TussCode.id)).scalar() or 0
     distinct_plans = (
         db.query(func.count(func.distinct(Product.plano_produto))).scalar() or 0
     )
     distinct_segments = (
-        db.query(func.count(func.distinct(Product.segmentacao))).scalar() or 0
+        db.query(func.count(Segment.id))
+        .filter(exists().where(Product.segment_id == Segment.id))
+        .scalar()
+        or 0
     )
     return StatsOut(
         total_products=total_products,
@@ -161,7 +244,7 @@ def get_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/filters/product-codes", response_model=list[str])
-def get_product_codes(db: Session = Depends(get_db)):
+def get_product_codes(db: Session = Depends(get_read_db)):
     results = (
         db.query(Product.cod_produto)
         .distinct()
@@ -172,7 +255,7 @@ def get_product_codes(db: Session = Depends(get_db)):
 
 
 @router.get("/filters/plan-names", response_model=list[str])
-def get_plan_names(db: Session = Depends(get_db)):
+def get_plan_names(db: Session = Depends(get_read_db)):
     results = (
         db.query(Product.plano_produto)
         .distinct()
@@ -183,30 +266,15 @@ def get_plan_names(db: Session = Depends(get_db)):
 
 
 @router.get("/filters/segments", response_model=list[str])
-def get_segments(db: Session = Depends(get_db)):
-    results = (
-        db.query(Product.segmentacao)
-        .distinct()
-        .order_by(Product.segmentacao)
-        .all()
-    )
-    return [r[0] for r in results]
+def get_segments(db: Session = Depends(get_read_db)):
+    return _used_names(db, Segment, Product.segment_id)
 
 
 @router.get("/filters/classifications", response_model=list[str])
-def get_classifications(db: Session = Depends(get_db)):
-    results = (
-        db.query(Product.classificacao)
-        .distinct()
-        .order_by(Product.classificacao)
-        .all()
-    )
-    return [r[0] for r in results]
+def get_classifications(db: Session = Depends(get_read_db)):
+    return _used_names(db, Classification, Product.classification_id)
 
 
 @router.get("/filters/statuses", response_model=list[str])
-def get_statuses(db: Session = Depends(get_db)):
-    results = (
-        db.query(Product.situacao).distinct().order_by(Product.situacao).all()
-    )
-    return [r[0] for r in results]
+def get_statuses(db: Session = Depends(get_read_db)):
+    return _used_names(db, Status, Product.status_id)
@@ -0,0 +1,63 @@
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from app.config import settings
+from app.snapshots import MANIFEST_NAME, SNAPSHOT_FILE_RE
+
+router = APIRouter(prefix="/api/snapshots", tags=["snapshots"])
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+
+def _encoding_weights(header: str) -> dict[str, float]:
+    """Accept-Encoding as {coding: q}; ``q=0`` means the coding is refused."""
+    weights = {}
+    for part in header.split(","):
+        coding, *params = [piece.strip() for piece in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.lower()] = q
+    return weights
+
+
+@router.get("/manifest.json")
+def get_manifest():
+    path = os.path.join(settings.snapshot_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="No snapshot published yet")
+    return FileResponse(
+        path,
+        media_type="application/json",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.get("/{filename}")
+def get_snapshot_file(filename: str, request: Request):
+    if not SNAPSHOT_FILE_RE.match(filename) or filename == MANIFEST_NAME:
+        raise HTTPException(status_code=404, detail="Snapshot file not found")
+
+    path = os.path.join(settings.snapshot_dir, filename)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Snapshot file not found")
+
+    headers = {"Cache-Control": IMMUTABLE_CACHE, "Vary": "Accept-Encoding"}
+    weights = _encoding_weights(request.headers.get("accept-encoding", ""))
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > 0 and os.path.exists(path + suffix):
+            path += suffix
+            headers["Content-Encoding"] = encoding
+            break
+
+    return FileResponse(path, media_type="application/json", headers=headers)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.cache import CatalogCache
+from app.database import get_read_db
+from app.schemas import PlanSuggestion, TussCodeFrontend
+from app.suggest import MAX_SUGGESTIONS, build_plan_index, build_tuss_index
+
+router = APIRouter(prefix="/api/suggest", tags=["suggest"])
+
+tuss_index = CatalogCache(build_tuss_index)
+plan_index = CatalogCache(build_plan_index)
+
+
+@router.get("/tuss", response_model=list[TussCodeFrontend])
+def suggest_tuss(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(15, ge=1, le=MAX_SUGGESTIONS),
+    db: Session = Depends(get_read_db),
+):
+    return [
+        TussCodeFrontend(code=codigo, description=descricao)
+        for codigo, descricao in tuss_index.get(db).search(q, limit)
+    ]
+
+
+@router.get("/plans", response_model=list[PlanSuggestion])
+def suggest_plans(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(15, ge=1, le=MAX_SUGGESTIONS),
+    db: Session = Depends(get_read_db),
+):
+    return [
+        PlanSuggestion(
+            productCode=cod_produto,
+            planName=plano_produto,
+            ansRegisteredName=nome_registrado_ans,
+        )
+        for cod_produto, plano_produto, nome_registrado_ans in plan_index.get(
+            db
+        ).search(q, limit)
+    ]
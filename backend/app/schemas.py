@@ -57,6 +57,30 @@ class TussCodeFrontend(BaseModel):
     description: str
 
 
+class TussTreeNode(BaseModel):
+    prefix: str
+    count: int
+    code: str | None = None
+    description: str | None = None
+
+
+class TussTreeOut(BaseModel):
+    prefix: str
+    count: int
+    children: list[TussTreeNode]
+
+
+class ProductGroup(BaseModel):
+    productCode: str
+    planNames: list[str]
+
+
+class PlanSuggestion(BaseModel):
+    productCode: str
+    planName: str
+    ansRegisteredName: str
+
+
 class PaginatedProducts(BaseModel):
     items: list[ProductFrontend]
     total: int
@@ -78,3 +102,37 @@ class StatsOut(BaseModel):
     total_tuss_codes: int
     distinct_plans: int
     distinct_segments: int
+
+
+class ChangeOut(BaseModel):
+    seq: int
+    entity: str
+    key: str
+    op: str
+    data: dict | None = None
+
+
+class ChangeFeed(BaseModel):
+    changes: list[ChangeOut]
+    next_since: int
+    has_more: bool
+
+
+def product_to_frontend(p) -> ProductFrontend:
+    return ProductFrontend(
+        productCode=p.cod_produto,
+        planName=p.plano_produto,
+        ansCode=p.plano_ans,
+        ansRegisteredName=p.nome_registrado_ans,
+        segment=p.segmentacao,
+        classification=p.classificacao,
+        operatorCode=p.cod_operadora,
+        operatorName=p.nome_operadora,
+        status=p.situacao,
+        apiProductCode=p.cod_produto_api,
+        apiPlanCode=p.cod_plano_api,
+    )
+
+
+def tuss_to_frontend(t) -> TussCodeFrontend:
+    return TussCodeFrontend(code=t.codigo, description=t.descricao)
@@ -0,0 +1,150 @@
+"""
+Static catalog snapshots for the frontend.
+
+Publishes the products and TUSS tables as content-hashed, sharded JSON files
+(already in frontend field names) plus gzip/brotli variants, and a small
+manifest pointing at the current shards. Shard file names never change for a
+given content, so they can be served with immutable caching.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+import brotli
+
+from app.changes import latest_seq
+from app.models import Product, TussCode
+from app.schemas import product_to_frontend, tuss_to_frontend
+
+MANIFEST_NAME = "manifest.json"
+TUSS_PREFIX_LENGTH = 2
+
+# Shard and manifest names written by the publisher, e.g. "tuss-40.1a2b3c4d5e6f7a8b.json"
+SNAPSHOT_FILE_RE = re.compile(r"^[A-Za-z0-9_-]+(\.[0-9a-f]{16})?\.json$")
+
+
+def _encode(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def _safe_key(key: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", key) or "_"
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_shard(out_dir: str, kind: str, key: str, rows: list[dict]) -> dict:
+    """Write one shard and its compressed variants, skipping unchanged content."""
+    data = _encode(rows)
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    filename = f"{kind}-{_safe_key(key)}.{digest}.json"
+    path = os.path.join(out_dir, filename)
+
+    if not os.path.exists(path):
+        _write_atomic(f"{path}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+        _write_atomic(f"{path}.br", brotli.compress(data, quality=11))
+        _write_atomic(path, data)
+
+    return {"file": filename, "hash": digest, "count": len(rows), "size": len(data)}
+
+
+def _referenced_files(manifest: dict) -> set[str]:
+    files = {manifest["file"]} if "file" in manifest else set()
+    for section in ("products", "tuss"):
+        for shard in manifest.get(section, {}).values():
+            files.add(shard["file"])
+    return files
+
+
+def _load_manifest(out_dir: str) -> dict | None:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _prune(out_dir: str, keep: set[str]) -> int:
+    removed = 0
+    for name in os.listdir(out_dir):
+        base = name.removesuffix(".gz").removesuffix(".br")
+        if base == MANIFEST_NAME or not SNAPSHOT_FILE_RE.match(base):
+            continue
+        if base not in keep:
+            os.remove(os.path.join(out_dir, name))
+            removed += 1
+    return removed
+
+
+def publish_snapshots(session, out_dir: str) -> dict:
+    """
+    Write the current catalog to ``out_dir`` and return the new manifest.
+
+    Products are sharded by product code and TUSS codes by their first
+    digits. Shards referenced by the previous manifest are kept so clients
+    that fetched it just before the swap can still finish downloading.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    previous = _load_manifest(out_dir)
+
+    # Read before the tables: a change committed in between then shows up in
+    # both the shards and the feed after change_seq, and replaying it is
+    # harmless, whereas reading it afterwards could skip it entirely
+    change_seq = latest_seq(session)
+
+    products: dict[str, list[dict]] = {}
+    for p in session.query(Product).order_by(Product.cod_produto, Product.id):
+        products.setdefault(p.cod_produto, []).append(
+            product_to_frontend(p).model_dump()
+        )
+
+    tuss: dict[str, list[dict]] = {}
+    for t in session.query(TussCode).order_by(TussCode.codigo):
+        tuss.setdefault(t.codigo[:TUSS_PREFIX_LENGTH], []).append(
+            tuss_to_frontend(t).model_dump()
+        )
+
+    manifest = {
+        "products": {
+            code: _write_shard(out_dir, "products", code, rows)
+            for code, rows in products.items()
+        },
+        "tuss": {
+            prefix: _write_shard(out_dir, "tuss", prefix, rows)
+            for prefix, rows in tuss.items()
+        },
+    }
+    version = hashlib.sha256(
+        json.dumps(manifest, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+
+    if previous and previous.get("version") == version:
+        return previous
+
+    manifest["version"] = version
+    manifest["generatedAt"] = datetime.now(timezone.utc).isoformat()
+    # Clients holding this snapshot can catch up from here via /api/changes
+    manifest["changeSeq"] = change_seq
+    manifest["file"] = f"manifest.{version}.json"
+
+    data = _encode(manifest)
+    _write_atomic(os.path.join(out_dir, manifest["file"]), data)
+    _write_atomic(os.path.join(out_dir, MANIFEST_NAME), data)
+
+    keep = _referenced_files(manifest)
+    if previous:
+        keep |= _referenced_files(previous)
+    _prune(out_dir, keep)
+
+    return manifest
@@ -0,0 +1,159 @@
+"""
+Prefix indexes behind the typeahead endpoints.
+
+Items are numbered in rank order (best first), so every posting list is
+already sorted by rank: a one-token search stops after the first ``k``
+matches, and a multi-token search intersects its candidate sets and takes the
+``k`` lowest positions, without ranking anything per request. Prefixes of up
+to ``PRECOMPUTED_PREFIX_LENGTH`` characters, which match too many tokens to
+merge per request, get their own posting list; longer prefixes use the lists
+of the few tokens they cover.
+"""
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from itertools import islice
+from collections import Counter
+
+from app.models import Product, TussCode
+
+PRECOMPUTED_PREFIX_LENGTH = 3
+MAX_SUGGESTIONS = 50
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents, matching the frontend's ``normalizeText``."""
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def _unique(positions):
+    """Drop repeats from a sorted stream (an item matched by two tokens)."""
+    last = None
+    for position in positions:
+        if position != last:
+            yield position
+            last = position
+
+
+class PrefixIndex:
+    """Top-k prefix search over items with precomputed ranks (lower is better)."""
+
+    def __init__(self, item_tokens: list[set[str]], ranks: list[tuple]):
+        # Position i holds the i-th best item
+        self._order = sorted(range(len(item_tokens)), key=ranks.__getitem__)
+
+        postings: dict[str, list[int]] = {}
+        self._short: dict[str, list[int]] = {}
+        for position, item in enumerate(self._order):
+            tokens = item_tokens[item]
+            for token in tokens:
+                postings.setdefault(token, []).append(position)
+            short = {
+                token[:length]
+                for token in tokens
+                for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1)
+            }
+            for prefix in short:
+                self._short.setdefault(prefix, []).append(position)
+
+        self._tokens = sorted(postings)
+        self._postings = [postings[token] for token in self._tokens]
+
+    def _postings_for(self, prefix: str) -> list[list[int]]:
+        """Posting lists whose union is every item with a token ``prefix*``."""
+        if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH:
+            return [self._short.get(prefix, [])]
+        lo = bisect_left(self._tokens, prefix)
+        hi = bisect_left(self._tokens, prefix + "\uffff", lo)
+        return self._postings[lo:hi]
+
+    def search(self, query: str, k: int) -> list[int]:
+        """Items with a token starting with every query token, best first."""
+        prefixes = set(tokenize(query))
+        if not prefixes:
+            return []
+
+        if len(prefixes) == 1:
+            # Lists are in rank order: merge them and stop after k items
+            lists = self._postings_for(prefixes.pop())
+            positions = lists[0] if len(lists) == 1 else heapq.merge(*lists)
+            return [self._order[p] for p in islice(_unique(positions), k)]
+
+        # Several tokens: intersect their candidates as sets, smallest first,
+        # so rare combinations cost no more than common ones
+        candidates = sorted(
+            (self._postings_for(prefix) for prefix in prefixes),
+            key=lambda lists: sum(map(len, lists)),
+        )
+        matched = set().union(*candidates[0])
+        for lists in candidates[1:]:
+            if not matched:
+                break
+            matched &= set().union(*lists)
+        return [self._order[p] for p in heapq.nsmallest(k, matched)]
+
+
+class TussSuggestIndex:
+    def __init__(self, rows: list[tuple[str, str]]):
+        self.rows = rows
+        self.index = PrefixIndex(
+            [{codigo, *tokenize(descricao)} for codigo, descricao in rows],
+            # Shorter descriptions are the more general procedures
+            [(len(descricao), codigo) for codigo, descricao in rows],
+        )
+
+    def search(self, query: str, k: int) -> list[tuple[str, str]]:
+        return [self.rows[item] for item in self.index.search(query, k)]
+
+
+class PlanSuggestIndex:
+    def __init__(self, rows: list[tuple[str, str, str]]):
+        # One suggestion per (product code, plan name), as picked in the UI
+        plans = {}
+        for cod_produto, plano_produto, nome_registrado_ans in rows:
+            plans.setdefault((cod_produto, plano_produto), nome_registrado_ans)
+        plan_counts = Counter(plano_produto for _, plano_produto, _ in rows)
+
+        self.rows = [
+            (cod_produto, plano_produto, nome)
+            for (cod_produto, plano_produto), nome in plans.items()
+        ]
+        self.index = PrefixIndex(
+            [
+                {cod_produto, *tokenize(plano_produto), *tokenize(nome)}
+                for cod_produto, plano_produto, nome in self.rows
+            ],
+            # Plan names shared by many products first, then shorter names
+            [
+                (-plan_counts[plano_produto], len(plano_produto), plano_produto)
+                for _, plano_produto, _ in self.rows
+            ],
+        )
+
+    def search(self, query: str, k: int) -> list[tuple[str, str, str]]:
+        return [self.rows[item] for item in self.index.search(query, k)]
+
+
+def build_tuss_index(db) -> TussSuggestIndex:
+    return TussSuggestIndex(
+        db.query(TussCode.codigo, TussCode.descricao).order_by(TussCode.codigo).all()
+    )
+
+
+def build_plan_index(db) -> PlanSuggestIndex:
+    return PlanSuggestIndex(
+        db.query(
+            Product.cod_produto, Product.plano_produto, Product.nome_registrado_ans
+        )
+        .order_by(Product.id)
+        .all()
+    )
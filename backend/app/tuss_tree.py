@@ -0,0 +1,58 @@
+"""Prefix tree over TUSS codes, whose digits encode the procedure hierarchy."""
+
+from collections import Counter
+
+from app.models import TussCode
+
+
+class TussTree:
+    """
+    Every prefix of every code, with the number of codes under it.
+
+    Children are precomputed per prefix, with chains of single-child prefixes
+    collapsed so each drill-down step shows a real branching point.
+    """
+
+    def __init__(self, rows: list[tuple[str, str]]):
+        self.counts = Counter()
+        self.descriptions = dict(rows)
+        direct_children: dict[str, set[str]] = {}
+        for codigo, _ in rows:
+            for length in range(len(codigo) + 1):
+                prefix = codigo[:length]
+                self.counts[prefix] += 1
+                if length < len(codigo):
+                    direct_children.setdefault(prefix, set()).add(
+                        codigo[: length + 1]
+                    )
+
+        def collapse(prefix: str) -> str:
+            while prefix not in self.descriptions:
+                below = direct_children.get(prefix, ())
+                if len(below) != 1:
+                    break
+                (prefix,) = below
+            return prefix
+
+        self.children = {
+            prefix: [self.node(collapse(child)) for child in sorted(below)]
+            for prefix, below in direct_children.items()
+        }
+
+    def node(self, prefix: str) -> dict:
+        return {
+            "prefix": prefix,
+            "count": self.counts[prefix],
+            "code": prefix if prefix in self.descriptions else None,
+            "description": self.descriptions.get(prefix),
+        }
+
+    def __contains__(self, prefix: str) -> bool:
+        # The root exists even when the catalog is empty
+        return prefix == "" or prefix in self.counts
+
+
+def build_tuss_tree(db) -> TussTree:
+    return TussTree(
+        db.query(TussCode.codigo, TussCode.descricao).order_by(TussCode.codigo).all()
+    )
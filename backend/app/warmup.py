@@ -0,0 +1,75 @@
+"""
+Startup warmup so the first requests after a deploy run at steady-state speed.
+
+Opens every pooled connection up front and runs the hot read statements on
+each of them (loading table and index metadata into each backend's caches),
+then builds the in-memory catalog indexes once.
+"""
+
+import logging
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import ReadSessionLocal, engine, read_engine, replica_monitor
+from app.routers import providers, suggest
+
+logger = logging.getLogger(__name__)
+
+
+def _run_hot_statements(db) -> None:
+    providers.list_products(
+        page=1,
+        page_size=50,
+        product_code=None,
+        plan_name=None,
+        segment=None,
+        classification=None,
+        status=None,
+        search=None,
+        db=db,
+    )
+    providers.list_tuss_codes(page=1, page_size=50, search=None, db=db)
+    providers.get_stats(db=db)
+    providers.get_product_codes(db=db)
+    providers.get_plan_names(db=db)
+    providers.get_segments(db=db)
+    providers.get_classifications(db=db)
+    providers.get_statuses(db=db)
+
+
+def _fill_pool(target_engine) -> None:
+    """
+    Check out ``db_pool_size`` sessions at once, so each pooled connection is
+    opened, and run the hot statements on every one of them.
+    """
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=target_engine)
+    sessions = [factory() for _ in range(settings.db_pool_size)]
+    try:
+        for db in sessions:
+            _run_hot_statements(db)
+    finally:
+        for db in sessions:
+            db.close()
+
+
+def warm_up() -> None:
+    started = time.monotonic()
+    try:
+        _fill_pool(read_engine)
+        if read_engine is not engine:
+            # Reads fall back to the primary when the replica lags
+            _fill_pool(engine)
+            replica_monitor.healthy()
+
+        with ReadSessionLocal() as db:
+            suggest.tuss_index.get(db)
+            suggest.plan_index.get(db)
+            providers.tuss_tree.get(db)
+            providers.product_groups.get(db)
+    except Exception as e:
+        # A cold start is slower, not broken
+        logger.warning(f"Warmup failed: {e}")
+        return
+    logger.info(f"Warmup finished in {time.monotonic() - started:.2f}s")
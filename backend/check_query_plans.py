@@ -0,0 +1,252 @@
+"""
+Query-plan regression check for the product endpoints.
+
+Copies the products table (with all of its indexes) into a scratch schema,
+scales it up, then calls each endpoint and runs EXPLAIN on every statement
+it issued. Exits non-zero if a sequential scan shows up on a table that the
+case expects to be served from an index.
+
+    DATABASE_URL=... python check_query_plans.py [--scale 50] [--allow-skip]
+
+The combined segment/classification/status case needs a combination covering
+under 1% of rows; if the data has none the check fails unless --allow-skip
+is given.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+# Add parent to path so we can import app modules
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.routers import providers
+
+DATABASE_URL = os.environ.get(
+    "DATABASE_URL", "postgresql://descobre:descobre@db:5432/descobre_saude"
+)
+SCHEMA = "query_plan_check"
+
+
+def build_dataset(engine, scale: int) -> dict:
+    """Create the scaled copy of products and return sample filter values."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(
+            text(
+                f"CREATE TABLE {SCHEMA}.products "
+                "(LIKE public.products INCLUDING ALL)"
+            )
+        )
+        # Product codes and plan names grow with the catalog; the lookup-table
+        # attributes keep their real distribution.
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.products (
+                    id, cod_produto, plano_produto, plano_ans,
+                    nome_registrado_ans, operator_id, segment_id,
+                    classification_id, status_id, cod_produto_api,
+                    cod_plano_api
+                )
+                SELECT
+                    row_number() OVER (), p.cod_produto || '-' || g,
+                    p.plano_produto || '-' || g, p.plano_ans,
+                    p.nome_registrado_ans, p.operator_id, p.segment_id,
+                    p.classification_id, p.status_id, p.cod_produto_api,
+                    p.cod_plano_api
+                FROM public.products p, generate_series(1, :scale) g
+                """
+            ),
+            {"scale": scale},
+        )
+        conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.products"))
+
+        product = conn.execute(
+            text(
+                f"SELECT cod_produto, plano_produto FROM {SCHEMA}.products "
+                "ORDER BY id LIMIT 1"
+            )
+        ).one()
+        # The most common segment/classification/status combination that is
+        # still selective enough (< 1% of rows) for an index to pay off.
+        combination = conn.execute(
+            text(
+                f"""
+                SELECT s.name AS segmentacao, c.name AS classificacao,
+                       st.name AS situacao
+                FROM {SCHEMA}.products p
+                JOIN segments s ON s.id = p.segment_id
+                JOIN classifications c ON c.id = p.classification_id
+                JOIN statuses st ON st.id = p.status_id
+                GROUP BY s.name, c.name, st.name
+                HAVING count(*) < 0.01 * (SELECT count(*) FROM {SCHEMA}.products)
+                ORDER BY count(*) DESC
+                LIMIT 1
+                """
+            )
+        ).first()
+        total = conn.execute(text(f"SELECT count(*) FROM {SCHEMA}.products")).scalar()
+
+    print(f"Built {SCHEMA}.products with {total} rows (scale {scale}).")
+    sample = dict(product._mapping)
+    # Scaling repeats every row equally, so whether one exists depends only on
+    # the source data; main() decides whether its absence is a failure
+    if combination is not None:
+        sample.update(combination._mapping)
+    return sample
+
+
+def list_products(db, **filters):
+    args = dict(
+        page=1,
+        page_size=50,
+        product_code=None,
+        plan_name=None,
+        segment=None,
+        classification=None,
+        status=None,
+        search=None,
+    )
+    args.update(filters)
+    return providers.list_products(db=db, **args)
+
+
+def build_cases(sample: dict) -> list[tuple[str, callable, set[str]]]:
+    """(name, endpoint call, tables that must not be sequentially scanned)."""
+    cases = [
+        ("filters/product-codes", providers.get_product_codes, {"products"}),
+        ("filters/plan-names", providers.get_plan_names, {"products"}),
+        ("filters/segments", providers.get_segments, {"products"}),
+        ("filters/classifications", providers.get_classifications, {"products"}),
+        ("filters/statuses", providers.get_statuses, {"products"}),
+        (
+            "products?product_code",
+            lambda db: list_products(db, product_code=sample["cod_produto"]),
+            {"products"},
+        ),
+        (
+            "products?product_code&plan_name",
+            lambda db: list_products(
+                db,
+                product_code=sample["cod_produto"],
+                plan_name=sample["plano_produto"],
+            ),
+            {"products"},
+        ),
+        (
+            "products/lookup",
+            lambda db: providers.lookup_product(
+                product_code=sample["cod_produto"],
+                plan_name=sample["plano_produto"],
+                db=db,
+            ),
+            {"products"},
+        ),
+        (
+            "products?plan_name",
+            lambda db: list_products(db, plan_name=sample["plano_produto"]),
+            {"products"},
+        ),
+    ]
+    if "segmentacao" in sample:
+        cases.append(
+            (
+                "products?segment&classification&status",
+                lambda db: list_products(
+                    db,
+                    segment=sample["segmentacao"],
+                    classification=sample["classificacao"],
+                    status=sample["situacao"],
+                ),
+                {"products"},
+            )
+        )
+    return cases
+
+
+def seq_scanned_tables(plan: dict) -> set[str]:
+    found = set()
+    if plan.get("Node Type") == "Seq Scan":
+        found.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found |= seq_scanned_tables(child)
+    return found
+
+
+def check_case(engine, name, call, indexed_tables) -> bool:
+    with engine.connect() as conn:
+        conn.execute(text(f"SET search_path TO {SCHEMA}, public"))
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(conn, "before_cursor_execute", capture)
+        with Session(bind=conn) as db:
+            call(db)
+        event.remove(conn, "before_cursor_execute", capture)
+
+        ok = True
+        cursor = conn.connection.cursor()
+        for statement, parameters in statements:
+            cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+            plan = cursor.fetchone()[0][0]["Plan"]
+            offending = seq_scanned_tables(plan) & indexed_tables
+            if offending:
+                ok = False
+                print(f"FAIL {name}: sequential scan on {', '.join(sorted(offending))}")
+                print(f"  {statement}")
+                print(json.dumps(plan, indent=2))
+        cursor.close()
+        conn.rollback()
+
+    if ok:
+        print(f"ok   {name} ({len(statements)} statements)")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=50)
+    parser.add_argument(
+        "--allow-skip",
+        action="store_true",
+        help="pass even if the combined-filter case cannot be built",
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+    try:
+        sample = build_dataset(engine, args.scale)
+        results = [
+            check_case(engine, name, call, tables)
+            for name, call, tables in build_cases(sample)
+        ]
+        if "segmentacao" not in sample:
+            # Without it the 3-column segment index goes untested
+            status = "skip" if args.allow_skip else "FAIL"
+            print(
+                f"{status} products?segment&classification&status: no "
+                "combination covers under 1% of rows"
+            )
+            results.append(args.allow_skip)
+    finally:
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    if not all(results):
+        sys.exit(1)
+    print("All query plans use the expected indexes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Read-routing check for a primary/replica pair.
+
+Verifies that read-only sessions go to the replica while it keeps up, fall
+back to the primary once it lags (replay is paused on the replica and a
+transaction committed on the primary), and return to the replica after it
+catches up. Needs a role allowed to call pg_wal_replay_pause() on the
+replica.
+
+    DATABASE_URL=... DATABASE_REPLICA_URL=... python check_replica_routing.py
+"""
+
+import os
+import sys
+import time
+
+# Check lag on every session and trip quickly; set before app.config loads
+os.environ.setdefault("REPLICA_LAG_CHECK_INTERVAL", "0")
+os.environ.setdefault("REPLICA_MAX_LAG_SECONDS", "1")
+
+from sqlalchemy import text
+
+# Add parent to path so we can import app modules
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.config import settings
+from app.database import engine, get_read_db, read_engine
+
+PROBE_TABLE = "replica_routing_check"
+
+
+def reads_from_replica() -> bool:
+    sessions = get_read_db()
+    db = next(sessions)
+    try:
+        return db.execute(text("SELECT pg_is_in_recovery()")).scalar()
+    finally:
+        sessions.close()
+
+
+def check(name: str, expected_replica: bool) -> bool:
+    on_replica = reads_from_replica()
+    ok = on_replica == expected_replica
+    target = "replica" if on_replica else "primary"
+    print(f"{'ok  ' if ok else 'FAIL'} {name}: reads go to the {target}")
+    return ok
+
+
+def wait_for_replay(timeout: float = 30.0) -> None:
+    with engine.connect() as conn:
+        lsn = conn.execute(text("SELECT pg_current_wal_lsn()")).scalar()
+    deadline = time.monotonic() + timeout
+    with read_engine.connect() as conn:
+        while time.monotonic() < deadline:
+            caught_up = conn.execute(
+                text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"),
+                {"lsn": lsn},
+            ).scalar()
+            if caught_up:
+                return
+            time.sleep(0.2)
+    raise RuntimeError("Replica did not catch up with the primary")
+
+
+def main():
+    if not settings.database_replica_url:
+        sys.exit("DATABASE_REPLICA_URL is not set")
+
+    replica = read_engine.execution_options(isolation_level="AUTOCOMMIT")
+    results = [check("replica in sync", True)]
+    try:
+        with replica.connect() as conn:
+            conn.execute(text("SELECT pg_wal_replay_pause()"))
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {PROBE_TABLE} (x int)"))
+        time.sleep(settings.replica_max_lag_seconds + 1)
+        with engine.begin() as conn:
+            conn.execute(text(f"INSERT INTO {PROBE_TABLE} VALUES (1)"))
+        results.append(check("replay paused", False))
+    finally:
+        with replica.connect() as conn:
+            conn.execute(text("SELECT pg_wal_replay_resume()"))
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {PROBE_TABLE}"))
+
+    wait_for_replay()
+    results.append(check("replay resumed", True))
+
+    if not all(results):
+        sys.exit(1)
+    print("Reads follow replica health.")
+
+
+if __name__ == "__main__":
+    main()
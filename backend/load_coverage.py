@@ -0,0 +1,45 @@
+"""Load the plan-by-procedure coverage matrix from a CSV file (or stdin)."""
+
+import argparse
+import os
+import sys
+
+from sqlalchemy import create_engine
+
+# Add parent to path so we can import app modules
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.coverage import COVERAGE_COLUMNS, load_coverage
+
+DATABASE_URL = os.environ.get(
+    "DATABASE_URL", "postgresql://descobre:descobre@db:5432/descobre_saude"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "csv_path",
+        help=f"CSV with header {','.join(COVERAGE_COLUMNS)}, or - for stdin",
+    )
+    args = parser.parse_args()
+
+    engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+    with engine.begin() as conn:
+        if args.csv_path == "-":
+            stats = load_coverage(conn, sys.stdin)
+        else:
+            with open(args.csv_path, "r", encoding="utf-8") as f:
+                stats = load_coverage(conn, f)
+
+    print(
+        f"Loaded {stats['pairs']} coverage pairs from {stats['staged']} rows: "
+        f"{stats['plans']} plans, {stats['codes']} TUSS codes."
+    )
+    unmatched = stats["staged"] - stats["pairs"]
+    if unmatched:
+        print(f"{unmatched} rows were duplicates or did not match a product/code.")
+
+
+if __name__ == "__main__":
+    main()
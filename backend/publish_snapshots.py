@@ -0,0 +1,37 @@
+"""Publish static catalog snapshots from the database for the frontend."""
+
+import os
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add parent to path so we can import app modules
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.config import settings
+from app.snapshots import publish_snapshots
+
+DATABASE_URL = os.environ.get(
+    "DATABASE_URL", "postgresql://descobre:descobre@db:5432/descobre_saude"
+)
+
+
+def main():
+    engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    try:
+        manifest = publish_snapshots(session, settings.snapshot_dir)
+        print(
+            f"Published snapshot {manifest['version']} to {settings.snapshot_dir}: "
+            f"{len(manifest['products'])} product shards, "
+            f"{len(manifest['tuss'])} TUSS shards."
+        )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
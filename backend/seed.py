@@ -5,14 +5,21 @@ import os
 import sys
 import time
 
-from sqlalchemy import create_engine
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 # Add parent to path so we can import app modules
 sys.path.insert(0, os.path.dirname(__file__))
 
-from app.database import Base
+from app.changes import OP_DELETE, product_change, tuss_change
+from app.config import settings
+from app.dimensions import DimensionCache
 from app.models import Product, TussCode
+from app.snapshots import publish_snapshots
 
 DATABASE_URL = os.environ.get(
     "DATABASE_URL", "postgresql://descobre:descobre@db:5432/descobre_saude"
@@ -46,6 +53,36 @@ def wait_for_db(engine, retries=30, delay=2):
     raise RuntimeError("Could not connect to database after multiple retries")
 
 
+# Migrations that drop products columns; the space only comes back once the
+# table is rewritten, which VACUUM FULL cannot do inside a migration
+REWRITE_PRODUCTS_AFTER = {"0003"}
+
+
+def run_migrations(engine):
+    """Bring the schema up to date, creating it on a fresh database."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    config = Config(os.path.join(here, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(here, "alembic"))
+
+    with engine.connect() as conn:
+        before = MigrationContext.configure(conn).get_current_revision()
+    pending = {
+        rev.revision
+        for rev in ScriptDirectory.from_config(config).iterate_revisions(
+            "head", before or "base"
+        )
+    }
+    command.upgrade(config, "head")
+
+    # A fresh database has no rows to reclaim
+    if before is not None and pending & REWRITE_PRODUCTS_AFTER:
+        print("Rewriting products to reclaim dropped columns (VACUUM FULL)...")
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            conn.execute(text("VACUUM FULL products"))
+
+
 def seed_products(session, json_path):
     """Load products from JSON and insert into DB."""
     existing_count = session.query(Product).count()
@@ -57,64 +94,104 @@ def seed_products(session, json_path):
         raw_products = json.load(f)
 
     print(f"Seeding {len(raw_products)} products...")
+    dimensions = DimensionCache(session)
     batch = []
+    changes = []
     for i, raw in enumerate(raw_products):
         product = Product(
             cod_produto=raw["codProduto"],
             plano_produto=raw["planoProduto"],
             plano_ans=raw["planoANS"],
             nome_registrado_ans=raw["nomeRegistradoANS"],
-            segmentacao=raw["segmentacao"],
-            classificacao=raw["classificacao"],
-            cod_operadora=raw["codOperadora"],
-            nome_operadora=raw["nomeOperadora"],
-            situacao=raw["situacao"],
             cod_produto_api=raw["codProdutoAPI"],
             cod_plano_api=raw["codPlanoAPI"],
         )
+        dimensions.assign(product, raw)
         batch.append(product)
+        changes.append(product_change(product))
 
         if len(batch) >= 1000:
             session.bulk_save_objects(batch)
+            session.bulk_save_objects(changes)
             session.commit()
             print(f"  Inserted {i + 1} products...")
             batch = []
+            changes = []
 
     if batch:
         session.bulk_save_objects(batch)
+        session.bulk_save_objects(changes)
         session.commit()
 
     final_count = session.query(Product).count()
     print(f"Seeded {final_count} products.")
 
 
+def sync_tuss_codes(session, raw_tuss):
+    """Bring an already seeded TUSS table in line with the JSON file."""
+    existing = {t.codigo: t for t in session.query(TussCode)}
+    seen = set()
+    added = updated = 0
+    for raw in raw_tuss:
+        seen.add(raw["codigo"])
+        tuss = existing.get(raw["codigo"])
+        if tuss is None:
+            tuss = TussCode(codigo=raw["codigo"], descricao=raw["descricao"])
+            session.add(tuss)
+            added += 1
+        elif tuss.descricao != raw["descricao"]:
+            tuss.descricao = raw["descricao"]
+            updated += 1
+        else:
+            continue
+        session.add(tuss_change(tuss))
+
+    # Codes dropped from the file get a tombstone for /api/changes clients
+    removed = [t for codigo, t in existing.items() if codigo not in seen]
+    for tuss in removed:
+        session.add(tuss_change(tuss, OP_DELETE))
+        session.delete(tuss)
+
+    session.commit()
+    print(
+        f"TUSS codes synced: {added} added, {updated} updated, "
+        f"{len(removed)} removed."
+    )
+
+
 def seed_tuss_codes(session, json_path):
     """Load TUSS codes from JSON and insert into DB."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        raw_tuss = json.load(f)
+
     existing_count = session.query(TussCode).count()
     if existing_count > 0:
-        print(f"TUSS codes table already has {existing_count} rows, skipping seed.")
+        print(f"TUSS codes table already has {existing_count} rows, syncing.")
+        sync_tuss_codes(session, raw_tuss)
         return
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        raw_tuss = json.load(f)
-
     print(f"Seeding {len(raw_tuss)} TUSS codes...")
     batch = []
+    changes = []
     for i, raw in enumerate(raw_tuss):
         tuss = TussCode(
             codigo=raw["codigo"],
             descricao=raw["descricao"],
         )
         batch.append(tuss)
+        changes.append(tuss_change(tuss))
 
         if len(batch) >= 1000:
             session.bulk_save_objects(batch)
+            session.bulk_save_objects(changes)
             session.commit()
             print(f"  Inserted {i + 1} TUSS codes...")
             batch = []
+            changes = []
 
     if batch:
         session.bulk_save_objects(batch)
+        session.bulk_save_objects(changes)
         session.commit()
 
     final_count = session.query(TussCode).count()
@@ -127,9 +204,8 @@ def main():
 
     wait_for_db(engine)
 
-    # Create tables
-    Base.metadata.create_all(bind=engine)
-    print("Tables created.")
+    run_migrations(engine)
+    print("Migrations applied.")
 
     Session = sessionmaker(bind=engine)
     session = Session()
@@ -138,6 +214,8 @@ def main():
         seed_products(session, PRODUCTS_JSON)
         seed_tuss_codes(session, TUSS_JSON)
         print("Seeding complete!")
+        manifest = publish_snapshots(session, settings.snapshot_dir)
+        print(f"Published catalog snapshot {manifest['version']}.")
     except Exception as e:
         session.rollback()
         print(f"Error during seeding: {e}")
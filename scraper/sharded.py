@@ -0,0 +1,137 @@
+"""
+Parallel, rate-limited product scraping sharded by product code.
+
+Each shard is one product code fetched from ``PRODUCTS_API_URL``, passed as
+the ``codProduto`` query parameter. That parameter is an assumption about the
+upstream API, not a documented contract, so ``PRODUCTS_API_URL`` has no
+default and sharded scraping is off until it is set (for example to the local
+stand-in server). A response containing any row of another product code is
+treated as a failed attempt, so an API that ignores the parameter makes every
+shard fail instead of re-storing the whole catalog once per code.
+
+Shards run in a bounded thread pool; every request, including retries, first
+takes a token from a single bucket shared by all workers, so the request rate
+upstream stays at ``SCRAPER_RATE_LIMIT`` no matter how many workers run.
+Results are yielded as each shard finishes so the caller can store them while
+the other shards are still being fetched.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator
+
+import requests
+
+logger = logging.getLogger("sul_america_scraper.sharded")
+
+# Unset by default: the per-code query against the real portal is unconfirmed
+PRODUCTS_API_URL = os.environ.get("PRODUCTS_API_URL")
+SCRAPER_WORKERS = int(os.environ.get("SCRAPER_WORKERS", "4"))
+# Requests per second across all workers
+SCRAPER_RATE_LIMIT = float(os.environ.get("SCRAPER_RATE_LIMIT", "5"))
+SCRAPER_RETRIES = int(os.environ.get("SCRAPER_RETRIES", "3"))
+REQUEST_TIMEOUT = 30
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_local = threading.local()
+
+
+def _http() -> requests.Session:
+    # One keep-alive session per worker thread
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def fetch_shard(cod_produto: str, limiter: TokenBucket) -> list[dict]:
+    """Fetch every plan of one product code, retrying with backoff."""
+    for attempt in range(1, SCRAPER_RETRIES + 1):
+        limiter.acquire()
+        try:
+            response = _http().get(
+                PRODUCTS_API_URL,
+                params={"codProduto": cod_produto},
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            products = response.json()
+            if not isinstance(products, list):
+                raise ValueError(f"expected a list, got {type(products).__name__}")
+            foreign = {
+                p.get("codProduto") if isinstance(p, dict) else None
+                for p in products
+            } - {cod_produto}
+            if foreign:
+                raise ValueError(
+                    f"response holds rows of other product codes: "
+                    f"{sorted(map(str, foreign))[:5]}"
+                )
+            return products
+        except (requests.RequestException, ValueError) as e:
+            if attempt == SCRAPER_RETRIES:
+                raise
+            delay = 2 ** (attempt - 1)
+            logger.warning(
+                f"Shard {cod_produto} attempt {attempt} failed ({e}), "
+                f"retrying in {delay}s"
+            )
+            time.sleep(delay)
+
+
+def scrape_shards(
+    codes: Iterable[str], workers: int = SCRAPER_WORKERS
+) -> Iterator[tuple[str, list[dict]]]:
+    """
+    Fetch all shards in parallel, yielding ``(cod_produto, products)`` as each
+    one finishes. Shards that still fail after their retries are logged and
+    skipped.
+    """
+    limiter = TokenBucket(SCRAPER_RATE_LIMIT)
+    codes = sorted(set(codes))
+    failed = []
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {pool.submit(fetch_shard, code, limiter): code for code in codes}
+        for future in as_completed(futures):
+            code = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Shard {code} failed: {e}")
+                failed.append(code)
+                continue
+            yield code, result
+    finally:
+        # If the consumer stops early, don't keep fetching the remaining shards
+        pool.shutdown(wait=False, cancel_futures=True)
+    if failed:
+        logger.error(f"{len(failed)} of {len(codes)} shards failed: {failed}")
@@ -0,0 +1,85 @@
+"""
+Local stand-in for the SulAmerica products API, for exercising the sharded
+scraper without touching the real portal.
+
+Serves ``src/data/products.json`` grouped by product code:
+
+    GET /produtos?codProduto=882  ->  JSON list of that code's plans
+
+Each response is delayed by ``--latency`` seconds to mimic a remote server,
+and ``--fail-rate`` makes that fraction of requests answer 503 to exercise
+the retries. Point the scraper at it with:
+
+    python standin_server.py --port 8765 &
+    PRODUCTS_API_URL=http://localhost:8765/produtos python sul_america_scraper.py
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_DATA = os.path.join(
+    os.path.dirname(__file__), "..", "src", "data", "products.json"
+)
+
+
+def make_handler(shards: dict[str, bytes], latency: float, fail_rate: float):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != "/produtos":
+                self.send_error(404)
+                return
+            time.sleep(latency)
+            if random.random() < fail_rate:
+                self.send_error(503)
+                return
+            code = parse_qs(url.query).get("codProduto", [""])[0]
+            body = shards.get(code, b"[]")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in SulAmerica products API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with open(args.data, encoding="utf-8") as f:
+        products = json.load(f)
+    grouped = defaultdict(list)
+    for product in products:
+        grouped[product["codProduto"]].append(product)
+    shards = {
+        code: json.dumps(plans, ensure_ascii=False).encode("utf-8")
+        for code, plans in grouped.items()
+    }
+
+    server = ThreadingHTTPServer(
+        ("", args.port), make_handler(shards, args.latency, args.fail_rate)
+    )
+    print(
+        f"Serving {len(products)} products in {len(shards)} shards "
+        f"on port {args.port}"
+    )
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,10 @@
 SulAmerica scraper using Selenium (headless Chrome).
 
 Scrapes product/plan data and TUSS codes from the SulAmerica public portal
-and stores them in the PostgreSQL database.
+and stores them in the PostgreSQL database. Every run scrapes the portal page
+to discover product codes; when ``PRODUCTS_API_URL`` is set, it then fetches
+the plans of every known or discovered code in parallel shards, one per
+product code (see ``sharded.py``).
 """
 
 import json
@@ -10,6 +13,7 @@ import logging
 import os
 import sys
 import time
+from contextlib import closing
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -19,7 +23,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
 
 # Add backend to path for models - works both locally and in Docker
@@ -31,8 +35,12 @@ for _p in [
         sys.path.insert(0, _p)
         break
 
-from app.database import Base
-from app.models import Product, TussCode
+from app.changes import OP_DELETE, compact_change_log, product_change
+from app.config import settings
+from app.dimensions import DimensionCache
+from app.models import PlanCoverage, Product, TussCode
+from app.snapshots import publish_snapshots
+from sharded import PRODUCTS_API_URL, SCRAPER_WORKERS, scrape_shards
 
 logging.basicConfig(
     level=logging.INFO,
@@ -44,10 +52,11 @@ DATABASE_URL = os.environ.get(
     "DATABASE_URL", "postgresql://descobre:descobre@db:5432/descobre_saude"
 )
 
-# SulAmerica API endpoints (public)
-PRODUCTS_API_URL = (
-    "https://portal.sulamericaseguros.com.br/api/v1/rede-referenciada/produtos"
-)
+# Delete stored plans a shard no longer returns; opt-in until the per-code
+# products API is confirmed to return every plan of the requested code
+SCRAPER_PRUNE = os.environ.get("SCRAPER_PRUNE", "").lower() in ("1", "true", "yes")
+
+# SulAmerica API endpoints (public); PRODUCTS_API_URL lives in sharded.py
 TUSS_API_URL = "https://www.ans.gov.br/component/tuss/"
 
 
@@ -134,36 +143,66 @@ def scrape_products_from_api() -> list[dict]:
     return products
 
 
+def _natural_key(raw: dict) -> tuple[str, str, str, str]:
+    return (
+        raw.get("codProduto", ""),
+        raw.get("planoProduto", ""),
+        raw.get("planoANS", ""),
+        raw.get("codPlanoAPI", ""),
+    )
+
+
+def _load_existing(session, products: list[dict]) -> dict:
+    """Stored products for the batch's product codes, by natural key."""
+    codes = {raw.get("codProduto", "") for raw in products}
+    return {
+        (p.cod_produto, p.plano_produto, p.plano_ans, p.cod_plano_api): p
+        for p in session.query(Product).filter(Product.cod_produto.in_(codes))
+    }
+
+
 def store_products(session, products: list[dict]) -> int:
     """Store scraped products in the database, updating existing ones."""
     if not products:
         logger.warning("No products to store.")
         return 0
 
+    dimensions = DimensionCache(session)
+    known = _load_existing(session, products)
     stored = 0
     for raw in products:
         try:
             # Check if product already exists
-            existing = (
-                session.query(Product)
-                .filter(
-                    Product.cod_produto == raw.get("codProduto", ""),
-                    Product.plano_produto == raw.get("planoProduto", ""),
-                    Product.cod_plano_api == raw.get("codPlanoAPI", ""),
-                )
-                .first()
-            )
+            key = _natural_key(raw)
+            existing = known.get(key)
 
             if existing:
-                # Update existing product
-                existing.plano_ans = raw.get("planoANS", "")
-                existing.nome_registrado_ans = raw.get("nomeRegistradoANS", "")
-                existing.segmentacao = raw.get("segmentacao", "")
-                existing.classificacao = raw.get("classificacao", "")
-                existing.cod_operadora = raw.get("codOperadora", "")
-                existing.nome_operadora = raw.get("nomeOperadora", "")
-                existing.situacao = raw.get("situacao", "")
-                existing.cod_produto_api = raw.get("codProdutoAPI", "")
+                # Update existing product, logging it only if something changed
+                updates = {
+                    "nome_registrado_ans": raw.get("nomeRegistradoANS", ""),
+                    "cod_produto_api": raw.get("codProdutoAPI", ""),
+                }
+                changed = False
+                for field, value in updates.items():
+                    if getattr(existing, field) != value:
+                        setattr(existing, field, value)
+                        changed = True
+                dimension_ids = (
+                    existing.operator_id,
+                    existing.segment_id,
+                    existing.classification_id,
+                    existing.status_id,
+                )
+                dimensions.assign(existing, raw)
+                if dimension_ids != (
+                    existing.operator_id,
+                    existing.segment_id,
+                    existing.classification_id,
+                    existing.status_id,
+                ):
+                    changed = True
+                if changed:
+                    session.add(product_change(existing))
             else:
                 # Insert new product
                 product = Product(
@@ -171,15 +210,13 @@ def store_products(session, products: list[dict]) -> int:
                     plano_produto=raw.get("planoProduto", ""),
                     plano_ans=raw.get("planoANS", ""),
                     nome_registrado_ans=raw.get("nomeRegistradoANS", ""),
-                    segmentacao=raw.get("segmentacao", ""),
-                    classificacao=raw.get("classificacao", ""),
-                    cod_operadora=raw.get("codOperadora", ""),
-                    nome_operadora=raw.get("nomeOperadora", ""),
-                    situacao=raw.get("situacao", ""),
                     cod_produto_api=raw.get("codProdutoAPI", ""),
                     cod_plano_api=raw.get("codPlanoAPI", ""),
                 )
+                dimensions.assign(product, raw)
                 session.add(product)
+                session.add(product_change(product))
+                known[key] = product
 
             stored += 1
 
@@ -190,6 +227,9 @@ def store_products(session, products: list[dict]) -> int:
         except Exception as e:
             logger.error(f"Error storing product: {e}")
             session.rollback()
+            # Lookup rows created since the last commit were rolled back too
+            dimensions = DimensionCache(session)
+            known = _load_existing(session, products)
             continue
 
     session.commit()
@@ -197,22 +237,116 @@ def store_products(session, products: list[dict]) -> int:
     return stored
 
 
+def prune_products(session, cod_produto: str, products: list[dict]) -> int:
+    """
+    Delete stored plans of ``cod_produto`` missing from its shard response.
+
+    A shard holds every plan of its product code, so anything stored for the
+    code but not returned no longer exists upstream. Each removal is logged
+    as a delete so ``/api/changes`` clients drop it too. Only runs with
+    ``SCRAPER_PRUNE`` enabled, and never for a response that holds rows of
+    another product code.
+    """
+    if not SCRAPER_PRUNE:
+        return 0
+    if any(raw.get("codProduto") != cod_produto for raw in products):
+        logger.error(f"Shard {cod_produto} holds other product codes, not pruning.")
+        return 0
+    if not products:
+        # An empty answer is more likely an upstream hiccup than a withdrawn
+        # product, so keep what is stored
+        logger.warning(f"Shard {cod_produto} returned no plans, not pruning.")
+        return 0
+
+    returned = {_natural_key(raw) for raw in products}
+    stale = [
+        product
+        for product in session.query(Product).filter(
+            Product.cod_produto == cod_produto
+        )
+        if (
+            product.cod_produto,
+            product.plano_produto,
+            product.plano_ans,
+            product.cod_plano_api,
+        )
+        not in returned
+    ]
+    if not stale:
+        return 0
+
+    # Coverage is keyed on products.id, so a deleted plan's row cascades away
+    # and a re-inserted plan (changed natural key) starts without coverage
+    covered = (
+        session.query(func.count(PlanCoverage.product_id))
+        .filter(PlanCoverage.product_id.in_([p.id for p in stale]))
+        .scalar()
+    )
+    for product in stale:
+        session.add(product_change(product, OP_DELETE))
+        session.delete(product)
+    session.commit()
+
+    logger.info(f"Removed {len(stale)} plans of product {cod_produto}.")
+    if covered:
+        logger.warning(
+            f"{covered} removed plans of product {cod_produto} had coverage; "
+            "reload the coverage matrix with backend/load_coverage.py."
+        )
+    return len(stale)
+
+
 def run_scraper():
     """Main scraper entry point."""
     logger.info("=" * 60)
     logger.info("Starting SulAmerica scraper run...")
     logger.info("=" * 60)
 
+    # Schema is owned by the backend's migrations (run by seed.py)
     engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-    Base.metadata.create_all(bind=engine)
     Session = sessionmaker(bind=engine)
     session = Session()
 
     try:
-        # Scrape products
-        products = scrape_products_from_api()
+        codes = {code for (code,) in session.query(Product.cod_produto).distinct()}
+        stored = removed = 0
+
+        # Discover product codes that are new upstream from the portal page
+        try:
+            products = scrape_products_from_api()
+        except Exception as e:
+            logger.error(f"Product discovery failed: {e}")
+            products = []
         if products:
-            store_products(session, products)
+            stored += store_products(session, products)
+            discovered = {p["codProduto"] for p in products if p.get("codProduto")}
+            logger.info(f"Discovered {len(discovered - codes)} new product codes.")
+            codes |= discovered
+
+        if PRODUCTS_API_URL:
+            logger.info(
+                f"Scraping {len(codes)} product codes from {PRODUCTS_API_URL} "
+                f"with {SCRAPER_WORKERS} workers..."
+            )
+            started = time.monotonic()
+            # Each shard is stored as soon as it arrives, while the rest are
+            # fetched; closing the generator on error cancels pending shards
+            with closing(scrape_shards(codes)) as shards:
+                for code, products in shards:
+                    stored += store_products(session, products)
+                    removed += prune_products(session, code, products)
+            logger.info(
+                f"Stored {stored} and removed {removed} products from "
+                f"{len(codes)} shards in {time.monotonic() - started:.1f}s."
+            )
+        else:
+            logger.info("PRODUCTS_API_URL is not set, skipping sharded scrape.")
+
+        if stored or removed:
+            compacted = compact_change_log(session)
+            logger.info(f"Compacted {compacted} superseded change log entries.")
+            manifest = publish_snapshots(session, settings.snapshot_dir)
+            logger.info(f"Published catalog snapshot {manifest['version']}.")
         else:
             logger.info(
                 "No new products scraped. Existing data from seed remains."